@@ -2,8 +2,10 @@ import argparse
 import json
 import os
 import re
+import threading
 
 import requests
+import urllib3
 from distro import name as distro_name
 from rich import print as pprint
 from rich.console import Console
@@ -218,7 +220,79 @@ def get_code_blocks(answer, config):
     return code_blocks
 
 
-def get_api_response(data, headers, config):
+def get_connection_pool(session, url):
+    """
+    Looks up the urllib3 connection pool that the session would use for a request
+    to the given URL, with the same TLS and proxy settings as the actual request.
+
+    Args:
+        session: A requests.Session object.
+        url: The URL of the API endpoint.
+
+    Returns:
+        A urllib3.HTTPConnectionPool object.
+    """
+
+    adapter = session.get_adapter(url)
+    settings = session.merge_environment_settings(url, {}, None, None, None)
+    if hasattr(adapter, "get_connection_with_tls_context"):
+        request = session.prepare_request(requests.Request("POST", url))
+        pool = adapter.get_connection_with_tls_context(
+            request, settings["verify"], settings["proxies"], settings["cert"]
+        )
+    else:
+        pool = adapter.get_connection(url, settings["proxies"])
+    adapter.cert_verify(pool, url, settings["verify"], settings["cert"])
+    return pool
+
+
+def open_pooled_connection(pool, timeout):
+    """
+    Connects a connection from the pool and returns it to the pool without
+    sending any request on it.
+
+    Args:
+        pool: A urllib3.HTTPConnectionPool object.
+        timeout: The maximum time in seconds to wait for the connection.
+    """
+
+    conn = pool._get_conn()
+    try:
+        if conn.sock is None:
+            conn.timeout = timeout
+            conn.connect()
+    except (OSError, urllib3.exceptions.HTTPError):
+        # Warming up is best-effort, the real request reports any errors
+        conn.close()
+    pool._put_conn(conn)
+
+
+def prewarm_connection(session, config):
+    """
+    Opens a connection to the API endpoint in the background so that the actual
+    request can reuse it from the session's connection pool. DNS resolution, TCP
+    and TLS setup happen while the user is still typing the prompt.
+
+    The background thread only uses the urllib3 connection pool, never the
+    session itself, so the actual request does not have to wait for it.
+
+    Args:
+        session: A requests.Session object whose connection pool is warmed up.
+        config: A dictionary containing configuration information.
+
+    Returns:
+        A started threading.Thread object.
+    """
+
+    pool = get_connection_pool(session, config["url"])
+    thread = threading.Thread(
+        target=open_pooled_connection, args=(pool, config["timeout"]), daemon=True
+    )
+    thread.start()
+    return thread
+
+
+def get_api_response(data, headers, config, session=None):
     """
     Sends a POST request to a remote server using the provided data and headers,
     then processes the response and executes any shell commands.
@@ -227,12 +301,13 @@ def get_api_response(data, headers, config):
         data: A dictionary containing the data to be sent in the request body.
         headers: A dictionary containing the headers to be sent with the request.
         config: A dictionary containing configuration information.
+        session: An optional requests.Session object used to send the request.
 
     Returns:
         None.
     """
 
-    with requests.post(
+    with (session or requests).post(
         config["url"],
         headers=headers,
         data=json.dumps(data),
@@ -268,8 +343,6 @@ def chat(prompt, config, record=None, playback=None):
     """
 
     prompt = " ".join(prompt)
-    if prompt == "":
-        prompt = input("How can I help you? ")
     headers = {
         "Content-Type": "application/json",
         "Authorization": f"Bearer {os.getenv('OPENAI_API_KEY')}",
@@ -277,7 +350,6 @@ def chat(prompt, config, record=None, playback=None):
 
     messages = [
         {"role": "system", "content": config["roles"][config["role"]]},
-        {"role": "user", "content": prompt},
     ]
     data = {
         "messages": messages,
@@ -293,12 +365,19 @@ def chat(prompt, config, record=None, playback=None):
     if playback:
         data["playback"] = playback
 
-    if debug:
-        pprint("--- Request ---")
-        pprint(data)
-        pprint("--- Response ---")
+    with requests.Session() as session:
+        if prompt == "":
+            prewarm_connection(session, config)
+            prompt = input("How can I help you? ")
+
+        messages.append({"role": "user", "content": prompt})
+
+        if debug:
+            pprint("--- Request ---")
+            pprint(data)
+            pprint("--- Response ---")
 
-    get_api_response(data, headers, config)
+        get_api_response(data, headers, config, session)
 
 
 def main():
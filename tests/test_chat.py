@@ -1,5 +1,9 @@
+import http.server
 import json
 import os
+import threading
+
+import requests
 
 from aish import aish
 
@@ -157,4 +161,138 @@ def test_process_delta(capsys):
     assert expected_output == captured.out
 
 
+def test_open_pooled_connection(mocker):
+    # Test that a fresh connection is connected and put back without a request
+    pool = mocker.Mock()
+    conn = pool._get_conn.return_value
+    conn.sock = None
+    aish.open_pooled_connection(pool, 60)
+    conn.connect.assert_called_once_with()
+    assert conn.timeout == 60
+    conn.request.assert_not_called()
+    pool._put_conn.assert_called_once_with(conn)
+
+    # Test that an already connected connection is left as it is
+    pool = mocker.Mock()
+    conn = pool._get_conn.return_value
+    aish.open_pooled_connection(pool, 60)
+    conn.connect.assert_not_called()
+    pool._put_conn.assert_called_once_with(conn)
+
+    # Test that connection errors are swallowed and the slot is returned
+    pool = mocker.Mock()
+    conn = pool._get_conn.return_value
+    conn.sock = None
+    conn.connect.side_effect = OSError
+    aish.open_pooled_connection(pool, 60)
+    conn.close.assert_called_once_with()
+    pool._put_conn.assert_called_once_with(conn)
+
+
+def test_chat_prewarms_connection(mocker, requests_mock):
+    url = "http://localhost:5000/api/chat"
+    config = {
+        "roles": {"default": "system prompt"},
+        "role": "default",
+        "model": "gpt-3.5-turbo",
+        "temperature": 0.5,
+        "top_p": 0.5,
+        "timeout": 60,
+        "url": url,
+    }
+    requests_mock.post(url, text="")
+    mocker.patch("builtins.input", return_value="list files")
+    mocker.patch("aish.aish.get_connection_pool")
+
+    # Make the warm up hang until the POST has been sent
+    warm_up_started = threading.Event()
+    release_warm_up = threading.Event()
+
+    def slow_warm_up(pool, timeout):
+        warm_up_started.set()
+        release_warm_up.wait(5)
+
+    mocker.patch("aish.aish.open_pooled_connection", side_effect=slow_warm_up)
+
+    aish.chat([], config)
+    assert warm_up_started.wait(5)
+
+    # Test that the POST is sent without waiting for the warm up and that no
+    # other request is sent
+    assert not release_warm_up.is_set()
+    assert [r.method for r in requests_mock.request_history] == ["POST"]
+    messages = requests_mock.request_history[0].json()["messages"]
+    assert messages == [
+        {"role": "system", "content": "system prompt"},
+        {"role": "user", "content": "list files"},
+    ]
+    release_warm_up.set()
+
+    # Test that no warm up is done when the prompt is given on the command line
+    aish.open_pooled_connection.reset_mock()
+    aish.chat(["list", "files"], config)
+    aish.open_pooled_connection.assert_not_called()
+
+
+def test_get_connection_pool():
+    # Test that the pool matches the scheme, host and port of the endpoint
+    with requests.Session() as session:
+        pool = aish.get_connection_pool(session, "http://localhost:5000/api/chat")
+        assert (pool.scheme, pool.host, pool.port) == ("http", "localhost", 5000)
+
+        pool = aish.get_connection_pool(
+            session, "https://api.openai.com/v1/chat/completions"
+        )
+        assert (pool.scheme, pool.host, pool.port) == ("https", "api.openai.com", 443)
+
+
+def test_chat_reuses_prewarmed_connection(mocker):
+    connections = []
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def setup(self):
+            connections.append(self.client_address)
+            super().setup()
+
+        def do_POST(self):
+            self.rfile.read(int(self.headers["Content-Length"]))
+            self.send_response(200)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    config = {
+        "roles": {"default": "system prompt"},
+        "role": "default",
+        "model": "gpt-3.5-turbo",
+        "temperature": 0.5,
+        "top_p": 0.5,
+        "timeout": 5,
+        "url": f"http://127.0.0.1:{server.server_port}/api/chat",
+    }
+    prewarm = mocker.spy(aish, "prewarm_connection")
+
+    # Let the warm up finish while the user is typing
+    def type_prompt(message):
+        prewarm.spy_return.join(5)
+        return "list files"
+
+    mocker.patch("builtins.input", side_effect=type_prompt)
+
+    try:
+        aish.chat([], config)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    # Test that the POST is sent on the connection opened by the warm up
+    assert len(connections) == 1
+
+
 # python_code.txt